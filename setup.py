@@ -1,10 +1,31 @@
 import os
+import pkgutil
 from pathlib import Path
 
 from setuptools import find_packages, setup
+from setuptools.command.build_py import build_py
 
 here = os.path.abspath(os.path.dirname(__file__))
-sample_dir = Path("traffic") / "data" / "samples"
+
+
+class build_py_commands(build_py):
+    """Freezes the list of console commands into the built package.
+
+    traffic.console reads the _commands.txt file when it exists instead of
+    scanning its own directory at each invocation.
+    """
+
+    def run(self):
+        super().run()
+        console_dir = Path("traffic") / "console"
+        commands = sorted(
+            name
+            for _, name, _ in pkgutil.iter_modules([console_dir.as_posix()])
+        )
+        target = Path(self.build_lib) / console_dir / "_commands.txt"
+        if target.parent.exists():
+            target.write_text("\n".join(commands) + "\n")
+
 
 try:
     # Get the long description from the README file
@@ -27,6 +48,7 @@ setup(
     long_description=long_description,
     # https://dustingram.com/articles/2018/03/16/markdown-descriptions-on-pypi
     long_description_content_type="text/markdown",
+    cmdclass={"build_py": build_py_commands},
     entry_points={
         "console_scripts": ["traffic=traffic.console:main"],
         "traffic.plugins": [
@@ -38,10 +60,9 @@ setup(
     packages=find_packages(),
     package_data={
         "traffic.data.airspaces": ["firs.json"],
-        "traffic.data.samples": list(
-            file.relative_to(sample_dir).as_posix()
-            for file in sample_dir.glob("**/*.json.gz")
-        ),
+        # glob patterns are expanded by setuptools, samples are all stored
+        # one level below traffic/data/samples
+        "traffic.data.samples": ["*.json.gz", "*/*.json.gz"],
         "traffic": [
             os.path.join("..", "icons", f)
             for f in os.listdir(os.path.join("icons"))
@@ -57,6 +78,7 @@ setup(
         "pyproj",  # required to build cartopy from source (better be explicit)
         "Cartopy",
         "Shapely",
+        "lxml",  # fast XML parsing for AIXM files
         "requests",
         "appdirs",  # proper configuration directories
         "paramiko",  # ssh connections
@@ -68,6 +90,7 @@ setup(
         "tqdm>=4.28",  # progressbars
         "cartotools==1.0",
         "pyModeS>=2.0",
+        "importlib_metadata; python_version < '3.8'",  # plugin entry points
     ],
     classifiers=[
         # How mature is this project? Common values are
@@ -0,0 +1,108 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from traffic.core.airspace import AirspaceInfo
+from traffic.data.airspaces.eurocontrol_aixm import AIXMAirspaceParser
+
+# Synthetic AIXM files: the Airspace member sits in a subdirectory of its
+# archive; DesignatedPoint and Navaid members at the root of theirs.
+fixture_dir = Path(__file__).parent / "data" / "aixm"
+
+
+def parser(aixm_path: Path, cache_dir: Path) -> AIXMAirspaceParser:
+    p = AIXMAirspaceParser(config_file=Path("traffic.conf"))
+    p.aixm_path = aixm_path
+    p.cache_dir = cache_dir
+    return p
+
+
+@pytest.fixture
+def aixm_dirs(tmp_path: Path):
+    aixm_path = tmp_path / "aixm"
+    shutil.copytree(fixture_dir.as_posix(), aixm_path.as_posix())
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    return aixm_path, cache_dir
+
+
+def check_content(aixm: AIXMAirspaceParser) -> None:
+    lfbbs = aixm["LFBBS"]
+    assert lfbbs is not None
+    assert lfbbs.type == "SECTOR"
+    assert lfbbs.bounds == (0, 44, 2, 45)
+    assert [(e.lower, e.upper) for e in lfbbs] == [(0, 195)]
+    assert aixm["LFBBZ"] is None
+
+    # all matches, whatever their type
+    assert set(a.name for a in aixm.search("LFBB")) == {
+        "LFBB",
+        "LFBBN",
+        "LFBBS",
+        "LFBBTMA",
+        "LFBBX",
+    }
+
+    (tma,) = aixm.search("LFBB/TMA")
+    assert tma.name == "LFBBTMA"
+    assert tma.bounds == (0, 44, 1, 45)
+    assert [(e.lower, e.upper) for e in tma] == [(15, 65)]
+
+    assert set(aixm.parse("LFBB/SECTOR")) == {
+        AirspaceInfo("LFBBN", "SECTOR"),
+        AirspaceInfo("LFBBS", "SECTOR"),
+    }
+
+    lfbbx = aixm["LFBBX"]
+    assert lfbbx is not None
+    assert lfbbx.bounds == (0, 44, 2, 46)
+    assert lfbbx.components == {
+        AirspaceInfo("LFBBN", "SECTOR"),
+        AirspaceInfo("LFBBS", "SECTOR"),
+    }
+
+    # contributors without any geometry produce an empty shape
+    empty = aixm["EMPTY"]
+    assert empty is not None
+    assert empty.shape.is_empty
+
+    (narak,) = aixm.points("NARAK")
+    assert (narak.latitude, narak.longitude) == (44, 1)
+    assert narak.type == "ICAO"
+    (tou,) = aixm.points("TOU")
+    assert (tou.latitude, tou.longitude) == (44, 2)
+    assert tou.type == "VOR_DME"
+    assert list(aixm.points("NOPE")) == []
+
+
+def test_parse(aixm_dirs) -> None:
+    aixm_path, cache_dir = aixm_dirs
+    check_content(parser(aixm_path, cache_dir))
+
+    assert (cache_dir / "aixm_airspace.xml").exists()
+    assert (cache_dir / "aixm_points.npz").exists()
+
+
+def test_cache(aixm_dirs, tmp_path: Path) -> None:
+    aixm_path, cache_dir = aixm_dirs
+    parser(aixm_path, cache_dir).init_cache()
+
+    # the second load only reads the cache files
+    empty_dir = tmp_path / "empty"
+    empty_dir.mkdir()
+    check_content(parser(empty_dir, cache_dir))
+
+
+def test_open_file(aixm_dirs) -> None:
+    aixm_path, cache_dir = aixm_dirs
+    aixm = parser(aixm_path, cache_dir)
+
+    # member found in a subdirectory of the archive
+    with aixm.open_file("Airspace.BASELINE") as fh:
+        assert b"LFBBTMA" in fh.read()
+
+    # extracted files take precedence over archives
+    (aixm_path / "Airspace.BASELINE").write_bytes(b"<extracted/>")
+    with aixm.open_file("Airspace.BASELINE") as fh:
+        assert fh.read() == b"<extracted/>"
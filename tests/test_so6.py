@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from shapely.geometry import box
+
+from traffic.core import Airspace
+from traffic.core.airspace import ExtrudedPolygon
+from traffic.data import SO6
+from traffic.data.so6.so6 import Flight
+
+
+def so6_sample() -> SO6:
+    """Builds flights flying eastwards, every 0.1 degree of latitude."""
+    lines = []
+    for flight_id in range(40):
+        lat = 43 + flight_id / 10
+        alt = 100 + 10 * flight_id
+        for i in range(10):
+            lines.append(
+                f"SEG{i} LFPG LFBO A320 {8 + i:02d}0000 {9 + i:02d}0000 "
+                f"{alt} {alt} 0 AFR{flight_id} 180101 180101 "
+                f"{lat * 60} {(i - 3) * 60} {lat * 60} {(i - 2) * 60} "
+                f"{flight_id} 0 0 0"
+            )
+    return SO6.from_so6(StringIO("\n".join(lines)))
+
+
+def test_intersects() -> None:
+    sector = Airspace(
+        "SECTOR",
+        [
+            ExtrudedPolygon(box(0, 44, 2, 46), 0, 200),
+            ExtrudedPolygon(box(0, 45, 2, 46), 200, 400),
+        ],
+    )
+    so6 = so6_sample()
+
+    expected = so6.intersects(sector, max_workers=1).flight_ids
+    assert len(expected) > 0
+    # prepared geometries must not be shared among threads
+    for _ in range(3):
+        assert so6.intersects(sector, max_workers=8).flight_ids == expected
+
+
+def test_at_unsorted() -> None:
+    flight = so6_sample()[0]
+    # times are not always monotonic in SO6 files
+    time1 = list(flight.data.time1)
+    time1[0], time1[1] = time1[1], time1[0]
+    flight = Flight(flight.data.assign(time1=time1))
+
+    position = flight.at(flight.start)
+    assert position.longitude == -2
+    assert position.latitude == 43
+
+
+def test_clip() -> None:
+    # flight 0 flies eastwards along 43N, one degree of longitude per hour
+    flight = so6_sample()[0]
+
+    assert flight.clip(box(10, 10, 11, 11)) is None
+
+    clipped = flight.clip(box(0.5, 42, 2.5, 44))
+    assert clipped is not None
+    day = datetime(2018, 1, 1, tzinfo=timezone.utc)
+    second = timedelta(seconds=1)
+    assert abs(clipped.start - (day + timedelta(hours=11.5))) < second
+    assert abs(clipped.stop - (day + timedelta(hours=13.5))) < second
+
+    lon, lat, _ = clipped.coords_array.T
+    assert abs(lon[0] - 0.5) < 1e-6 and abs(lon[-1] - 2.5) < 1e-6
+    assert (abs(lat - 43) < 1e-6).all()
+    assert clipped.data.callsign.dtype == "category"
+    assert set(clipped.data.callsign) == {"AFR0"}
+
+
+def test_empty() -> None:
+    flight = so6_sample()[0]
+    sector = Airspace("SECTOR", [ExtrudedPolygon(box(0, 42, 2, 44), 0, 200)])
+
+    empty = Flight(flight.data.iloc[:0])
+    assert empty.linestring.is_empty
+    assert not empty.intersects(sector)
+
+    # no segment in range
+    instant = flight.between(flight.start, timedelta(0))
+    assert instant.data.shape[0] == 0
+    assert instant.linestring.is_empty
@@ -5,6 +5,7 @@ import pkgutil
 import subprocess
 import sys
 from pathlib import Path
+from typing import List
 
 
 def dispatch_open(filename: Path):
@@ -34,16 +35,30 @@ def import_submodules(package, recursive=True):
     return results
 
 
+def list_commands() -> List[str]:
+    """Returns the names of all available commands.
+
+    Installed packages come with a frozen list of commands (see setup.py);
+    otherwise, submodules are listed but not imported.
+    """
+    frozen = Path(__file__).parent / "_commands.txt"
+    if frozen.exists():
+        return frozen.read_text().split()
+    return sorted(name for _, name, _ in pkgutil.iter_modules(__path__))
+
+
 def main():
 
-    cmd = import_submodules(__name__, recursive=False)
+    # Importing all submodules (see import_submodules) would import most of
+    # the library before even parsing arguments.
+    commands = list_commands()
 
     parser = argparse.ArgumentParser(
         description="traffic command-line interface",
         epilog="For specific help about each command, type traffic command -h",
     )
 
-    parser.add_argument("command", help=f"among: {', '.join(cmd.keys())}")
+    parser.add_argument("command", help=f"among: {', '.join(commands)}")
     parser.add_argument(
         "args",
         nargs=argparse.REMAINDER,
@@ -52,9 +67,8 @@ def main():
 
     args = parser.parse_args()
 
-    mod = cmd.get(args.command, None)
-
-    if mod is None:
+    if args.command not in commands:
         return parser.print_help()
 
+    mod = importlib.import_module(f"{__name__}.{args.command}")
     return mod.main(args.args)
@@ -1,7 +1,9 @@
 # fmt: off
 
 import json
+import threading
 from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 from typing import (Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple,
                     TypeVar, Union)
@@ -11,7 +13,8 @@ from cartopy.crs import PlateCarree
 from cartopy.mpl.geoaxes import GeoAxesSubplot
 from matplotlib.patches import Polygon as MplPolygon
 from shapely.geometry import Polygon, base, mapping, shape
-from shapely.ops import cascaded_union
+from shapely.ops import cascaded_union, unary_union
+from shapely.prepared import PreparedGeometry, prep
 
 from . import Flight, Traffic
 from .lazy import lazy_evaluation
@@ -46,14 +49,38 @@ class Airspace(ShapelyMixin):
         self.name: str = name
         self.type: Optional[str] = type_
 
+    @lru_cache()
     def flatten(self) -> Polygon:
-        """Returns the 2D footprint of the airspace."""
+        """Returns the 2D footprint of the airspace.
+
+        The result is cached: the union is computed only once even though
+        bounds, plots and representations all rely on it.
+        """
         return cascaded_union([p.polygon for p in self])
 
     @property
     def shape(self):
         return self.flatten()
 
+    def prepared(self) -> List[PreparedGeometry]:
+        """Returns the prepared geometry of each layer.
+
+        Prepared geometries make repeated predicates (e.g. intersects) on the
+        same polygons much faster. GEOS fills them lazily on first use, so
+        they must not be shared among threads: each thread gets its own.
+        """
+        if "_local" not in self.__dict__:
+            self._local = threading.local()
+        if not hasattr(self._local, "prepared"):
+            self._local.prepared = list(prep(p.polygon) for p in self)
+        return self._local.prepared
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # thread-local prepared geometries are neither shared nor pickled
+        state = self.__dict__.copy()
+        state.pop("_local", None)
+        return state
+
     def __getitem__(self, *args) -> ExtrudedPolygon:
         return self.elements.__getitem__(*args)
 
@@ -113,7 +140,7 @@ class Airspace(ShapelyMixin):
         if "projection" in ax.__dict__:
             ax.add_geometries([flat], crs=PlateCarree(), **kwargs)
         else:
-            ax.add_patch(MplPolygon(list(flat.exterior.coords), **kwargs))
+            ax.add_patch(MplPolygon(np.asarray(flat.exterior.coords), **kwargs))
 
     @property
     def point(self) -> PointMixin:
@@ -126,23 +153,26 @@ class Airspace(ShapelyMixin):
         return components[self.name]
 
     def decompose(self, extr_p):
-        c = np.stack(extr_p.polygon.exterior.coords)
-        alt = np.zeros(c.shape[0], dtype=float)
+        c = np.asarray(extr_p.polygon.exterior.coords)
+        n = c.shape[0]
 
-        alt[:] = min(extr_p.upper, 400) * 30.48
-        upper_layer = np.c_[c, alt]
+        # both layers and all side walls are filled into preallocated buffers
+        upper_layer = np.empty((n, 3))
+        upper_layer[:, :2] = c[:, :2]
+        upper_layer[:, 2] = min(extr_p.upper, 400) * 30.48
         yield Polygon(upper_layer)
-        alt[:] = max(0, extr_p.lower) * 30.48
-        lower_layer = np.c_[c, alt][::-1, :]
+        lower_layer = np.empty((n, 3))
+        lower_layer[:, :2] = c[::-1, :2]
+        lower_layer[:, 2] = max(0, extr_p.lower) * 30.48
         yield Polygon(lower_layer)
 
-        for i, j in zip(range(c.shape[0] - 1), range(c.shape[0], 1, -1)):
-            yield Polygon(
-                np.r_[
-                    lower_layer[i : i + 2, :],  # noqa: E203
-                    upper_layer[j - 2 : j, :],  # noqa: E203
-                ]
-            )
+        sides = np.empty((n - 1, 4, 3))
+        sides[:, 0] = lower_layer[:-1]
+        sides[:, 1] = lower_layer[1:]
+        sides[:, 2] = upper_layer[-2::-1]
+        sides[:, 3] = upper_layer[:0:-1]
+        for side in sides:
+            yield Polygon(side)
 
     def above(self, level: int) -> "Airspace":
         return Airspace(
@@ -198,17 +228,37 @@ def cascaded_union_with_alt(polyalt: AirspaceList) -> AirspaceList:
     altitudes = set(alt for _, *low_up in polyalt for alt in low_up)
     slices = sorted(altitudes)
     if len(slices) == 1 and slices[0] is None:
-        simple_union = cascaded_union([p for p, *_ in polyalt])
+        simple_union = unary_union([p for p, *_ in polyalt])
         return [ExtrudedPolygon(simple_union, float("-inf"), float("inf"))]
+
+    polygons = [p for p, *_ in polyalt]
+    lows = np.fromiter((low for _, low, _ in polyalt), dtype=float)
+    ups = np.fromiter((up for *_, up in polyalt), dtype=float)
+
+    # polygons sorted by lower bound: for each slice, candidates are a prefix
+    # found by binary search, then filtered on their upper bound
+    order = np.argsort(lows, kind="stable")
+    starts, ends = lows[order], ups[order]
+
     results: List[ExtrudedPolygon] = []
+    last_idx: Optional[np.ndarray] = None
     for low, up in zip(slices, slices[1:]):
-        matched_poly = [
-            p
-            for (p, low_, up_) in polyalt
-            if low_ <= low <= up_ and low_ <= up <= up_
-        ]
-        new_poly = ExtrudedPolygon(cascaded_union(matched_poly), low, up)
-        if len(results) > 0 and new_poly.polygon.equals(results[-1].polygon):
+        k = np.searchsorted(starts, low, side="right")
+        idx = order[:k][ends[:k] >= up]
+        if last_idx is not None and np.array_equal(idx, last_idx):
+            # same polygons as the previous slice, hence the same union
+            merged = ExtrudedPolygon(results[-1].polygon, results[-1].lower, up)
+            results[-1] = merged
+            continue
+        last_idx = idx
+        matched_poly = [polygons[i] for i in idx]
+        new_poly = ExtrudedPolygon(unary_union(matched_poly), low, up)
+        # comparing bounds first is a cheap way to avoid most GEOS equals
+        if (
+            len(results) > 0
+            and new_poly.polygon.bounds == results[-1].polygon.bounds
+            and new_poly.polygon.equals(results[-1].polygon)
+        ):
             merged = ExtrudedPolygon(new_poly.polygon, results[-1].lower, up)
             results[-1] = merged
         else:
@@ -265,25 +315,28 @@ def _flight_intersects(
 
     """
     linestring = flight.airborne().linestring
-    if linestring is None:
+    if linestring is None or linestring.is_empty:
         return False
+
+    # no need to go any further if bounding boxes do not overlap
+    west, south, east, north = linestring.bounds
+    s_west, s_south, s_east, s_north = shape.bounds
+    if east < s_west or west > s_east or north < s_south or south > s_north:
+        return False
+
     if isinstance(shape, base.BaseGeometry):
         return not linestring.intersection(shape).is_empty
-    for layer in shape:
+    for layer, prepared in zip(shape, shape.prepared()):
+        # cheap reject before computing the actual intersection
+        if not prepared.intersects(linestring):
+            continue
         ix = linestring.intersection(layer.polygon)
         if not ix.is_empty:
-            if isinstance(ix, base.BaseMultipartGeometry):
-                for part in ix:
-                    if any(
-                        100 * layer.lower < x[2] < 100 * layer.upper
-                        for x in part.coords
-                    ):
-                        return True
-            else:
-                if any(
-                    100 * layer.lower < x[2] < 100 * layer.upper
-                    for x in ix.coords
-                ):
+            parts = ix if isinstance(ix, base.BaseMultipartGeometry) else [ix]
+            low, up = 100 * layer.lower, 100 * layer.upper
+            for part in parts:
+                alt = np.asarray(part.coords)[:, 2]
+                if np.any((low < alt) & (alt < up)):
                     return True
     return False
 
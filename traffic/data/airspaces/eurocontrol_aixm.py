@@ -2,16 +2,20 @@
 
 import logging
 import operator
-import pickle
 import re
 import warnings
 import zipfile
+from collections import defaultdict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import lru_cache
 from pathlib import Path
-from typing import (Any, Callable, Dict, Iterator, List, NamedTuple, Optional,
-                    Tuple, Union)
-from xml.etree import ElementTree
+from typing import (IO, Any, Callable, Dict, Iterable, Iterator, List,
+                    NamedTuple, Optional, Set, Tuple, Union)
 
+import numpy as np
+from lxml import etree
 from shapely.geometry import Polygon
 from shapely.ops import cascaded_union
 
@@ -33,6 +37,74 @@ class Point(NamedTuple):
         return f"{self.name} ({self.type}): {self.latitude} {self.longitude}"
 
 
+class _PointTable(Mapping):
+    """Read-only mapping from AIXM identifiers to Points.
+
+    Coordinates are stored in one contiguous (N, 2) array of latitudes and
+    longitudes: Point objects are only built when they are accessed.
+    """
+
+    def __init__(
+        self,
+        identifiers: List[str],
+        coords: np.ndarray,
+        names: List[Optional[str]],
+        types: List[Optional[str]],
+    ) -> None:
+        self.identifiers = identifiers
+        self.coords = coords.reshape(-1, 2)
+        self.names = names
+        self.types = types
+        self.index: Dict[str, int] = {
+            key: i for i, key in enumerate(identifiers)
+        }
+
+    def __getitem__(self, key: str) -> Point:
+        i = self.index[key]
+        lat, lon = self.coords[i].tolist()
+        return Point(lat, lon, self.names[i], self.types[i])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def with_name(self, name: str) -> Iterator[Point]:
+        for i, point_name in enumerate(self.names):
+            if point_name == name:
+                yield self[self.identifiers[i]]
+
+    @classmethod
+    def concatenate(cls, tables: List["_PointTable"]) -> "_PointTable":
+        return cls(
+            [key for table in tables for key in table.identifiers],
+            np.concatenate([table.coords for table in tables]),
+            [name for table in tables for name in table.names],
+            [type_ for table in tables for type_ in table.types],
+        )
+
+    def to_npz(self, filename: Path) -> None:
+        # missing names and types are stored as empty strings
+        np.savez(
+            filename.as_posix(),
+            identifiers=np.array(self.identifiers, dtype=str),
+            coords=self.coords,
+            names=np.array([x or "" for x in self.names], dtype=str),
+            types=np.array([x or "" for x in self.types], dtype=str),
+        )
+
+    @classmethod
+    def from_npz(cls, filename: Path) -> "_PointTable":
+        with np.load(filename.as_posix()) as content:
+            return cls(
+                content["identifiers"].tolist(),
+                content["coords"],
+                [x or None for x in content["names"].tolist()],
+                [x or None for x in content["types"].tolist()],
+            )
+
+
 class _Airport(NamedTuple):
     latitude: float
     longitude: float
@@ -54,6 +126,19 @@ def _re_match_ignorecase(x, y):
     return re.match(x, y, re.IGNORECASE)
 
 
+def _first(elements: List[Any]) -> Optional[Any]:
+    return elements[0] if len(elements) > 0 else None
+
+
+def _limit(element: Optional[Any], default: float) -> float:
+    # numerical limits start with three digits, e.g. 195 (flight level);
+    # a plain str test avoids going through the re module for each block
+    if element is None or element.text is None:
+        return default
+    text = element.text
+    return float(text) if len(text) >= 3 and text[:3].isdigit() else default
+
+
 class AIXMAirspaceParser(object):
 
     ns = {
@@ -64,6 +149,48 @@ class AIXMAirspaceParser(object):
         "xlink": "http://www.w3.org/1999/xlink",
     }
 
+    # XPath expressions are compiled once and for all
+    _xp_all_identifiers = etree.XPath(
+        "adrmsg:hasMember/aixm:Airspace/gml:identifier", namespaces=ns
+    )
+    _xp_all_designators = etree.XPath(
+        "adrmsg:hasMember/aixm:Airspace/aixm:timeSlice/"
+        "aixm:AirspaceTimeSlice/aixm:designator",
+        namespaces=ns,
+    )
+    _xp_with_geometry = etree.XPath(
+        "adrmsg:hasMember/aixm:Airspace[aixm:timeSlice/aixm:AirspaceTimeSlice"
+        "/aixm:geometryComponent]/gml:identifier/text()",
+        namespaces=ns,
+        smart_strings=False,
+    )
+    _xp_has_type = etree.XPath("aixm:type = $type_", namespaces=ns)
+    _xp_timeslice = etree.XPath(
+        "aixm:timeSlice/aixm:AirspaceTimeSlice", namespaces=ns
+    )
+    _xp_designator = etree.XPath("aixm:designator", namespaces=ns)
+    _xp_type = etree.XPath("aixm:type", namespaces=ns)
+    _xp_upper = etree.XPath("aixm:upperLimit", namespaces=ns)
+    _xp_lower = etree.XPath("aixm:lowerLimit", namespaces=ns)
+    _xp_volume = etree.XPath(
+        "aixm:geometryComponent/aixm:AirspaceGeometryComponent/"
+        "aixm:theAirspaceVolume/aixm:AirspaceVolume",
+        namespaces=ns,
+    )
+    _xp_contributor = etree.XPath(
+        "aixm:contributorAirspace/aixm:AirspaceVolumeDependency/"
+        "aixm:theAirspace",
+        namespaces=ns,
+    )
+    _xp_ring = etree.XPath(
+        "aixm:horizontalProjection/aixm:Surface/gml:patches/"
+        "gml:PolygonPatch/gml:exterior/gml:LinearRing",
+        namespaces=ns,
+    )
+    _xp_ring_points = etree.XPath(
+        ".//gml:pos | .//gml:pointProperty", namespaces=ns
+    )
+
     aixm_path: Optional[Path] = None
     cache_dir: Optional[Path] = None
 
@@ -79,182 +206,214 @@ class AIXMAirspaceParser(object):
             raise RuntimeError(msg)
 
         self.full_dict: Dict[str, Any] = {}
-        self.all_points: Dict[str, Point] = {}
+        # AirspaceTimeSlice elements, indexed by designator
+        self.by_designator: Dict[str, List[Any]] = defaultdict(list)
+        # identifiers of airspaces with at least one geometry component
+        self.has_geometry: Set[str] = set()
 
         assert self.aixm_path.is_dir()
 
-        cache_file = self.cache_dir / "aixm.pkl"
-        if cache_file.exists():
-            with cache_file.open("rb") as fh:
-                self.full_dict, self.all_points, self.tree = pickle.load(fh)
-                self.initialized = True
-                return
-
-        for filename in [
-            "AirportHeliport.BASELINE",
-            "Airspace.BASELINE",
-            "DesignatedPoint.BASELINE",
-            "Navaid.BASELINE",
-            "StandardInstrumentArrival.BASELINE",
-        ]:
-
-            if ~(self.aixm_path / filename).exists():
-                zippath = zipfile.ZipFile(
-                    self.aixm_path.joinpath(f"{filename}.zip").as_posix()
-                )
-                zippath.extractall(self.aixm_path.as_posix())
+        # The Airspace tree is stored as plain XML; the point table as numpy
+        # arrays. Both load much faster than a pickled tree of elements.
+        tree_file = self.cache_dir / "aixm_airspace.xml"
+        points_file = self.cache_dir / "aixm_points.npz"
+        if tree_file.exists() and points_file.exists():
+            self.tree = etree.parse(tree_file.as_posix())
+            self.index_airspaces()
+            self.all_points = _PointTable.from_npz(points_file)
+            self.initialized = True
+            return
+
+        # the three files are independent: lxml releases the GIL while
+        # parsing and zlib while decompressing, so they are read concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            tree = executor.submit(self.parse_file, "Airspace.BASELINE")
+            points = [
+                executor.submit(
+                    self.read_points,
+                    "DesignatedPoint.BASELINE",
+                    "DesignatedPoint",
+                    "Point",
+                ),
+                executor.submit(
+                    self.read_points,
+                    "Navaid.BASELINE",
+                    "Navaid",
+                    "ElevatedPoint",
+                ),
+            ]
 
-        self.tree = ElementTree.parse(
-            (self.aixm_path / "Airspace.BASELINE").as_posix()
-        )
+            self.tree = tree.result()
+            self.index_airspaces()
 
-        for airspace in self.tree.findall(
-            "adrmsg:hasMember/aixm:Airspace", self.ns
-        ):
+            self.all_points = _PointTable.concatenate(
+                [future.result() for future in points]
+            )
 
-            identifier = airspace.find("gml:identifier", self.ns)
-            assert identifier is not None
-            assert identifier.text is not None
-            self.full_dict[identifier.text] = airspace
+        self.tree.write(tree_file.as_posix())
+        self.all_points.to_npz(points_file)
 
-        points = ElementTree.parse(
-            (self.aixm_path / "DesignatedPoint.BASELINE").as_posix()
-        )
+        self.initialized = True
 
-        for point in points.findall(
-            "adrmsg:hasMember/aixm:DesignatedPoint", self.ns
-        ):
+    @contextmanager
+    def open_file(self, filename: str) -> Iterator[IO[bytes]]:
+        """Opens a BASELINE file, or streams it from its zip archive.
 
-            identifier = point.find("gml:identifier", self.ns)
-            assert identifier is not None
-            assert identifier.text is not None
+        Archives are not extracted to disk anymore: the member is
+        decompressed on the fly while the parser reads it.
+        """
+        assert self.aixm_path is not None
 
-            floats = point.find(
-                "aixm:timeSlice/aixm:DesignatedPointTimeSlice/"
-                "aixm:location/aixm:Point/gml:pos",
-                self.ns,
-            )
-            assert floats is not None
-            assert floats.text is not None
+        path = self.aixm_path / filename
+        if path.exists():
+            with path.open("rb") as fh:
+                yield fh
+            return
 
-            designator = point.find(
-                "aixm:timeSlice/aixm:DesignatedPointTimeSlice/aixm:designator",
-                self.ns,
-            )
-            type_ = point.find(
-                "aixm:timeSlice/aixm:DesignatedPointTimeSlice/aixm:type",
-                self.ns,
+        zip_path = self.aixm_path / f"{filename}.zip"
+        with zipfile.ZipFile(zip_path.as_posix()) as zip_file:
+            member = next(
+                name for name in zip_file.namelist() if name.endswith(filename)
             )
+            with zip_file.open(member) as fh:
+                yield fh
 
-            name = designator.text if designator is not None else None
-            type_str = type_.text if type_ is not None else None
+    def parse_file(self, filename: str) -> Any:
+        with self.open_file(filename) as fh:
+            return etree.parse(fh)
 
-            coords = tuple(float(x) for x in floats.text.split())
-            self.all_points[identifier.text] = Point(
-                coords[0], coords[1], name, type_str
-            )
+    def index_airspaces(self) -> None:
+        """Fills the identifier and designator tables from the XML tree.
 
-        points = ElementTree.parse(
-            (self.aixm_path / "Navaid.BASELINE").as_posix()
-        )
+        Each table comes from one single XPath query evaluated by libxml2.
+        """
 
-        for point in points.findall("adrmsg:hasMember/aixm:Navaid", self.ns):
+        root = self.tree.getroot()
 
-            identifier = point.find("gml:identifier", self.ns)
-            assert identifier is not None
-            assert identifier.text is not None
+        for identifier in self._xp_all_identifiers(root):
+            self.full_dict[identifier.text] = identifier.getparent()
 
-            floats = point.find(
-                "aixm:timeSlice/aixm:NavaidTimeSlice/"
-                "aixm:location/aixm:ElevatedPoint/gml:pos",
-                self.ns,
-            )
-            assert floats is not None
-            assert floats.text is not None
+        for designator in self._xp_all_designators(root):
+            if designator.text is not None:
+                ts = designator.getparent()
+                self.by_designator[designator.text].append(ts)
 
-            designator = point.find(
-                "aixm:timeSlice/aixm:NavaidTimeSlice/aixm:designator", self.ns
-            )
-            type_ = point.find(
-                "aixm:timeSlice/aixm:NavaidTimeSlice/aixm:type", self.ns
-            )
+        self.has_geometry = set(self._xp_with_geometry(root))
 
-            name = designator.text if designator is not None else None
-            type_str = type_.text if type_ is not None else None
+    def read_points(
+        self, filename: str, kind: str, location: str
+    ) -> _PointTable:
+        """Returns the table of all points from a BASELINE file.
 
-            coords = tuple(float(x) for x in floats.text.split())
-            self.all_points[identifier.text] = Point(
-                coords[0], coords[1], name, type_str
-            )
+        The file is parsed incrementally and elements are cleared as soon as
+        they are read. All gml:pos texts are gathered first, then parsed in
+        one single call to numpy.
+        """
 
-        with cache_file.open("wb") as fh:
-            pickle.dump((self.full_dict, self.all_points, self.tree), fh)
+        timeslice = f"aixm:timeSlice/aixm:{kind}TimeSlice"
 
-        self.initialized = True
+        identifiers: List[str] = []
+        names: List[Optional[str]] = []
+        types: List[Optional[str]] = []
+        texts: List[str] = []
+
+        with self.open_file(filename) as fh:
+            for _, point in etree.iterparse(
+                fh, tag="{%s}%s" % (self.ns["aixm"], kind)
+            ):
+
+                identifier = point.find("gml:identifier", self.ns)
+                assert identifier is not None
+                assert identifier.text is not None
+
+                floats = point.find(
+                    f"{timeslice}/aixm:location/aixm:{location}/gml:pos",
+                    self.ns,
+                )
+                assert floats is not None
+                assert floats.text is not None
+
+                designator = point.find(f"{timeslice}/aixm:designator", self.ns)
+                type_ = point.find(f"{timeslice}/aixm:type", self.ns)
+
+                name = designator.text if designator is not None else None
+                type_str = type_.text if type_ is not None else None
+
+                identifiers.append(identifier.text)
+                names.append(name)
+                types.append(type_str)
+                texts.append(floats.text)
+
+                # free the memory of elements already read
+                point.clear()
+                member = point.getparent()
+                while member.getprevious() is not None:
+                    del member.getparent()[0]
+
+        coords = (
+            np.fromstring("\n".join(texts), sep=" ")
+            if len(texts) > 0
+            else np.empty((0, 2))
+        )
+
+        return _PointTable(identifiers, coords, names, types)
 
     def points(self, name: str) -> Iterator[Point]:
         if not self.initialized:
             self.init_cache()
-        return (
-            point for point in self.all_points.values() if point.name == name
-        )
+        return self.all_points.with_name(name)
 
     def append_coords(self, lr, block_poly):
-        coords: List[Tuple[float, ...]] = []
         gml, xlink = self.ns["gml"], self.ns["xlink"]
-        for point in lr.iter():
-            if point.tag in ("{%s}pos" % (gml), "{%s}pointProperty" % (gml)):
-                if point.tag.endswith("pos"):
-                    coords.append(tuple(float(x) for x in point.text.split()))
-                else:
-                    points = point.attrib["{%s}href" % (xlink)]
-                    current_point = self.all_points[points.split(":")[2]]
-                    coords.append(
-                        (current_point.latitude, current_point.longitude)
-                    )
-        block_poly.append(
-            (Polygon([(lon, lat) for lat, lon in coords]), None, None)
-        )
+        pos_tag, ref_tag = "{%s}pos" % (gml), "{%s}pointProperty" % (gml)
+
+        # gml:pos texts are buffered and parsed at once, referenced points
+        # are rows of the point table; both keep their rank in the ring
+        pos_idx: List[int] = []
+        texts: List[str] = []
+        ref_idx: List[int] = []
+        rows: List[int] = []
+        index = self.all_points.index
+
+        for point in self._xp_ring_points(lr):
+            if point.tag == pos_tag:
+                pos_idx.append(len(pos_idx) + len(ref_idx))
+                texts.append(point.text)
+            elif point.tag == ref_tag:
+                points = point.attrib["{%s}href" % (xlink)]
+                ref_idx.append(len(pos_idx) + len(ref_idx))
+                rows.append(index[points.split(":")[2]])
+
+        coords = np.empty((len(pos_idx) + len(ref_idx), 2))
+        if len(texts) > 0:
+            parsed = np.fromstring(" ".join(texts), sep=" ")
+            coords[pos_idx] = parsed.reshape(-1, 2)
+        if len(rows) > 0:
+            coords[ref_idx] = self.all_points.coords[rows]
+
+        # (lat, lon) -> (lon, lat)
+        block_poly.append((Polygon(coords[:, ::-1]), None, None))
 
     @lru_cache(None)
     def make_polygon(self, airspace) -> AirspaceList:
         polygons: AirspaceList = []
-        designator = airspace.find("aixm:designator", self.ns)
+        designator = _first(self._xp_designator(airspace))
         if designator is not None:
             name = designator.text
-        for block in airspace.findall(
-            "aixm:geometryComponent/aixm:AirspaceGeometryComponent/"
-            "aixm:theAirspaceVolume/aixm:AirspaceVolume",
-            self.ns,
-        ):
+        for block in self._xp_volume(airspace):
             block_poly: AirspaceList = []
-            upper = block.find("aixm:upperLimit", self.ns)
-            lower = block.find("aixm:lowerLimit", self.ns)
-
-            upper = (  # noqa: W605
-                float(upper.text)
-                if upper is not None and re.match("\d{3}", upper.text)
-                else float("inf")
-            )
-            lower = (  # noqa: W605
-                float(lower.text)
-                if lower is not None and re.match("\d{3}", lower.text)
-                else float("-inf")
-            )
+            upper = _limit(_first(self._xp_upper(block)), float("inf"))
+            lower = _limit(_first(self._xp_lower(block)), float("-inf"))
 
-            for component in block.findall(
-                "aixm:contributorAirspace/aixm:AirspaceVolumeDependency/"
-                "aixm:theAirspace",
-                self.ns,
-            ):
+            for component in self._xp_contributor(block):
                 key = component.attrib["{http://www.w3.org/1999/xlink}href"]
                 key = key.split(":")[2]
                 child = self.full_dict[key]
-                for ats in child.findall(
-                    "aixm:timeSlice/aixm:AirspaceTimeSlice", self.ns
-                ):
-                    new_d = ats.find("aixm:designator", self.ns)
-                    new_t = ats.find("aixm:type", self.ns)
+                # no need to walk down airspaces without any geometry
+                empty = key not in self.has_geometry
+                for ats in self._xp_timeslice(child):
+                    new_d = _first(self._xp_designator(ats))
+                    new_t = _first(self._xp_type(ats))
                     if new_d is not None:
                         if designator is not None:
                             components[name].add(
@@ -263,23 +422,14 @@ class AIXMAirspaceParser(object):
                                     new_t.text if new_t is not None else None,
                                 )
                             )
-                        block_poly += self.make_polygon(ats)
-                    else:
-                        for sub in ats.findall(
-                            "aixm:geometryComponent/"
-                            "aixm:AirspaceGeometryComponent/"
-                            "aixm:theAirspaceVolume/aixm:AirspaceVolume",
-                            self.ns,
-                        ):
-
-                            assert sub.find("aixm:lowerLimit", self.ns) is None
-
-                            for lr in sub.findall(
-                                "aixm:horizontalProjection/aixm:Surface/"
-                                "gml:patches/gml:PolygonPatch/gml:exterior/"
-                                "gml:LinearRing",
-                                self.ns,
-                            ):
+                        if not empty:
+                            block_poly += self.make_polygon(ats)
+                    elif not empty:
+                        for sub in self._xp_volume(ats):
+
+                            assert len(self._xp_lower(sub)) == 0
+
+                            for lr in self._xp_ring(sub):
                                 self.append_coords(lr, block_poly)
 
                     break  # only one timeslice
@@ -307,40 +457,24 @@ class AIXMAirspaceParser(object):
         if not self.initialized:
             self.init_cache()
 
-        polygon = None
         type_: Optional[str] = None
 
         names = name.split("/")
         if len(names) > 1:
             name, type_ = names
 
-        for airspace in self.tree.findall(
-            "adrmsg:hasMember/aixm:Airspace", self.ns
-        ):
-            for ts in airspace.findall(
-                "aixm:timeSlice/aixm:AirspaceTimeSlice", self.ns
-            ):
+        for designator, ts in self._lookup(name, cmp, type_):
 
-                designator = ts.find("aixm:designator", self.ns)
+            ts_type = _first(self._xp_type(ts))
+            type_str = ts_type.text if ts_type is not None else None
 
-                if (
-                    designator is not None
-                    and cmp(name, designator.text)
-                    and (
-                        type_ is None
-                        or ts.find("aixm:type", self.ns).text == type_
-                    )
-                ):
-
-                    polygon = self.make_polygon(ts)
-                    type_ = ts.find("aixm:type", self.ns).text
-                    if len(polygon) > 0:
-                        yield Airspace(designator.text, polygon, type_)
-                    else:
-                        warnings.warn(
-                            f"{designator.text} produces an empty airspace",
-                            RuntimeWarning,
-                        )
+            polygon = self.make_polygon(ts)
+            if len(polygon) > 0:
+                yield Airspace(designator, polygon, type_str)
+            else:
+                warnings.warn(
+                    f"{designator} produces an empty airspace", RuntimeWarning
+                )
 
     def parse(
         self, pattern: str, cmp: Callable = _re_match_ignorecase
@@ -356,32 +490,42 @@ class AIXMAirspaceParser(object):
         if len(names) > 1:
             name, type_pattern = names
 
-        for airspace in self.tree.findall(
-            "adrmsg:hasMember/aixm:Airspace", self.ns
-        ):
-            for ts in airspace.findall(
-                "aixm:timeSlice/aixm:AirspaceTimeSlice", self.ns
-            ):
+        for designator, ts in self._lookup(name, cmp, type_pattern):
 
-                type_ = ts.find("aixm:type", self.ns)
-                designator = ts.find("aixm:designator", self.ns)
+            type_ = _first(self._xp_type(ts))
+            yield AirspaceInfo(
+                designator, type_.text if type_ is not None else None
+            )
 
-                if (
-                    type_pattern is None
-                    or (type_ is not None and type_.text == type_pattern)
-                ) and (designator is not None and cmp(name, designator.text)):
-                    yield AirspaceInfo(
-                        designator.text,
-                        type_.text if type_ is not None else None,
-                    )
+    def _lookup(
+        self, name: str, cmp: Callable, type_: Optional[str] = None
+    ) -> Iterator[Tuple[str, Any]]:
+        """Yields (designator, AirspaceTimeSlice) pairs matching name.
+
+        Exact matches are a simple dictionary lookup; other comparison
+        functions only run through the designators, not the whole tree.
+        The type, if any, is checked by a compiled XPath expression.
+        """
+        candidates: Iterable[Tuple[str, List[Any]]]
+        if cmp is operator.eq:
+            candidates = ((name, self.by_designator.get(name, [])),)
+        else:
+            candidates = (
+                (designator, elements)
+                for designator, elements in self.by_designator.items()
+                if cmp(name, designator)
+            )
+
+        for designator, elements in candidates:
+            for ts in elements:
+                if type_ is None or self._xp_has_type(ts, type_=type_):
+                    yield designator, ts
 
     def airports(self) -> Iterator[Tuple[str, _Airport]]:
 
         assert self.aixm_path is not None
 
-        a_tree = ElementTree.parse(
-            (self.aixm_path / "AirportHeliport.BASELINE").as_posix()
-        )
+        a_tree = self.parse_file("AirportHeliport.BASELINE")
 
         for elt in a_tree.findall(
             "adrmsg:hasMember/aixm:AirportHeliport", self.ns
@@ -446,9 +590,7 @@ class AIXMAirspaceParser(object):
             key: airport for key, airport in self.airports()
         }
 
-        tree = ElementTree.parse(
-            (self.aixm_path / "StandardInstrumentArrival.BASELINE").as_posix()
-        )
+        tree = self.parse_file("StandardInstrumentArrival.BASELINE")
 
         for elt in tree.findall(
             "adrmsg:hasMember/" "aixm:StandardInstrumentArrival", self.ns
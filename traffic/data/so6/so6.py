@@ -2,11 +2,12 @@
 
 import warnings
 from calendar import timegm
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from functools import lru_cache
 from io import StringIO
 from pathlib import Path
-from typing import (Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type,
+from typing import (Dict, Iterable, Iterator, Optional, Set, Tuple, Type,
                     TypeVar, Union)
 
 import numpy as np
@@ -27,6 +28,8 @@ from ...core.time import time_or_delta, timelike, to_datetime
 # https://github.com/python/mypy/issues/2511
 SO6TypeVar = TypeVar("SO6TypeVar", bound="SO6")
 
+_plate_carree = PlateCarree()
+
 
 def time(int_: int) -> datetime:
     ts = timegm((2000 + int_ // 10000, int_ // 100 % 100, int_ % 100, 0, 0, 0))
@@ -39,6 +42,21 @@ def hour(int_: int) -> timedelta:
     )
 
 
+def _timestamps(date: pd.Series, hour: pd.Series) -> pd.Series:
+    """Vectorised equivalent of time(date) + hour(hour) over full columns."""
+    date, hour = date.astype("int64"), hour.astype("int64")
+    day = pd.to_datetime(
+        {
+            "year": 2000 + date // 10000,
+            "month": date // 100 % 100,
+            "day": date % 100,
+        },
+        utc=True,
+    )
+    seconds = hour // 10000 * 3600 + hour // 100 % 100 * 60 + hour % 100
+    return day + pd.to_timedelta(seconds, unit="s")
+
+
 class Flight(FlightMixin):
     def __init__(self, data: pd.DataFrame) -> None:
         super().__init__(data)
@@ -53,11 +71,35 @@ class Flight(FlightMixin):
 
     @property
     def timestamp(self) -> Iterator[pd.Timestamp]:
-        if self.data.shape[0] == 0:
-            return
-        for _, s in self.data.iterrows():
-            yield s.time1
-        yield s.time2
+        yield from self.times_array
+
+    # https://github.com/python/mypy/issues/1362
+    @property  # type: ignore
+    @lru_cache()
+    def times_array(self) -> pd.DatetimeIndex:
+        """Returns the N + 1 timestamps matching coords_array."""
+        return pd.DatetimeIndex(
+            pd.concat([self.data.time1, self.data.time2.iloc[-1:]])
+        )
+
+    # https://github.com/python/mypy/issues/1362
+    @property  # type: ignore
+    @lru_cache()
+    def epoch_array(self) -> np.ndarray:
+        """Returns times_array as float seconds since the epoch."""
+        return self.times_array.asi8 / 1e9
+
+    # https://github.com/python/mypy/issues/1362
+    @property  # type: ignore
+    @lru_cache()
+    def _sorted_by_time(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns epoch_array and coords_array, sorted by time.
+
+        Timestamps are not always monotonic in SO6 files: the stable sort
+        matches the one interp1d performs on unsorted input.
+        """
+        order = np.argsort(self.epoch_array, kind="mergesort")
+        return self.epoch_array[order], self.coords_array[order]
 
     @property
     def aircraft(self) -> str:
@@ -92,17 +134,26 @@ class Flight(FlightMixin):
         else:
             yield s.time2, s.lon2, s.lat2, s.alt2
 
+    # https://github.com/python/mypy/issues/1362
+    @property  # type: ignore
+    @lru_cache()
+    def coords_array(self) -> np.ndarray:
+        """Returns the (N + 1, 3) array of (lon, lat, alt) coordinates."""
+        first = self.data[["lon1", "lat1", "alt1"]].values
+        last = self.data[["lon2", "lat2", "alt2"]].values[-1:]
+        return np.vstack([first, last])
+
     @property
     def coords(self) -> Iterator[Tuple[float, float, float]]:
-        if self.data.shape[0] == 0:
-            return
-        for _, s in self.data.iterrows():
-            yield s.lon1, s.lat1, s.alt1
-        yield s.lon2, s.lat2, s.alt2
+        yield from map(tuple, self.coords_array.tolist())
 
-    @property
+    # https://github.com/python/mypy/issues/1362
+    @property  # type: ignore
+    @lru_cache()
     def linestring(self) -> LineString:
-        return LineString(list(self.coords))
+        if self.data.shape[0] == 0:
+            return LineString()
+        return LineString(self.coords_array)
 
     @property
     def shape(self) -> LineString:
@@ -113,14 +164,24 @@ class Flight(FlightMixin):
 
     def interpolate(self, times, proj=PlateCarree()) -> np.ndarray:
         """Interpolates a trajectory in time.  """
+        # coordinates are already in PlateCarree: no need to project them
+        identity = proj == _plate_carree
         if proj not in self.interpolator:
+            t, coords = self._sorted_by_time
+            coords = coords.T
+            if not identity:
+                coords = proj.transform_points(_plate_carree, *coords).T
+            # arrays are sorted once for all, and never modified afterwards
             self.interpolator[proj] = interp1d(
-                np.stack(t.to_pydatetime().timestamp() for t in self.timestamp),
-                proj.transform_points(
-                    PlateCarree(), *np.stack(self.coords).T
-                ).T,
+                t,
+                coords,
+                axis=-1,
+                copy=False,
+                assume_sorted=True,
             )
-        return PlateCarree().transform_points(
+        if identity:
+            return self.interpolator[proj](times).T
+        return _plate_carree.transform_points(
             proj, *self.interpolator[proj](times)
         )
 
@@ -129,11 +190,16 @@ class Flight(FlightMixin):
             raise NotImplementedError()
 
         time = to_datetime(time)
-        timearray: np.ndarray[datetime] = np.array([time.timestamp()])
-        res = self.interpolate(timearray)
+        timestamp = time.timestamp()
+        t, coords = self._sorted_by_time
+        if not t[0] <= timestamp <= t[-1]:
+            raise ValueError(f"{time} is out of the time range of the flight")
+
+        # one linear interpolation per dimension, no interpolator required
+        res = list(np.interp(timestamp, t, c) for c in coords.T)
 
         return Position(
-            pd.Series(res[0], index=["longitude", "latitude", "altitude"])
+            pd.Series(res, index=["longitude", "latitude", "altitude"])
         )
 
     def between(self, start: timelike, stop: time_or_delta) -> "Flight":
@@ -143,67 +209,71 @@ class Flight(FlightMixin):
         else:
             stop = to_datetime(stop)
 
-        t: np.ndarray = np.stack(self.timestamp)
-        index = np.where((start < t) & (t < stop))
+        t = self.times_array
+        index = np.flatnonzero((start < t) & (t < stop))
 
-        new_data: np.ndarray = np.stack(self.coords)[index]
-        time1: List[datetime] = [start, *t[index]]
-        time2: List[datetime] = [*t[index], stop]
+        new_data: np.ndarray = self.coords_array[index]
+        times = t[index]
 
         if start > t[0]:
             new_data = np.vstack([self.at(start), new_data])
-        else:
-            time1, time2 = time1[1:], time2[1:]
+            times = times.insert(0, start)
         if stop < t[-1]:
             new_data = np.vstack([new_data, self.at(stop)])
-        else:
-            time1, time2 = time1[:-1], time2[:-1]
-
-        df: pd.DataFrame = (
-            pd.DataFrame.from_records(
-                np.c_[new_data[:-1, :], new_data[1:, :]],
-                columns=["lon1", "lat1", "alt1", "lon2", "lat2", "alt2"],
-            ).assign(
-                time1=time1,
-                time2=time2,
-                origin=self.origin,
-                destination=self.destination,
-                aircraft=self.aircraft,
-                flight_id=self.flight_id,
-                callsign=self.callsign,
-            )
+            times = times.insert(len(times), stop)
+
+        # metadata are repeated from the first segment, so they keep their
+        # dtype (categories) rather than being broadcast as plain strings
+        first = self.data.iloc[np.zeros(len(times) - 1, dtype=int)]
+        metadata = (
+            "origin",
+            "destination",
+            "aircraft",
+            "flight_id",
+            "callsign",
+        )
+
+        df = pd.DataFrame(
+            {
+                "lon1": new_data[:-1, 0],
+                "lat1": new_data[:-1, 1],
+                "alt1": new_data[:-1, 2],
+                "lon2": new_data[1:, 0],
+                "lat2": new_data[1:, 1],
+                "alt2": new_data[1:, 2],
+                "time1": times[:-1],
+                "time2": times[1:],
+                **{column: first[column].values for column in metadata},
+            }
         )
 
         return Flight(df)
 
     def clip(self, shape: base.BaseGeometry) -> Optional["Flight"]:
-        linestring = LineString(list(self.xy_time))
-        intersection = linestring.intersection(shape)
-        begin: Optional[datetime] = None
+        # timestamps stand as third dimension: the intersection is computed
+        # only once and carries its own entry and exit times
+        xy_time = np.c_[self.coords_array[:, :2], self.epoch_array]
+        intersection = LineString(xy_time).intersection(shape)
 
         if intersection.is_empty:
             return None
 
-        if isinstance(intersection, LineString):
-            begin, *_, end = list(
-                datetime.fromtimestamp(t, timezone.utc)
-                for t in np.stack(intersection.coords)[:, 2]
-            )
-
+        if isinstance(intersection, base.BaseMultipartGeometry):
+            parts = list(intersection)
         else:
-            for x in LineString(list(self.xy_time)).intersection(shape):
-                begin_, *_, end = list(
-                    datetime.fromtimestamp(t, timezone.utc)
-                    for t in np.stack(x.coords)[:, 2]
-                )
-                if begin is None:
-                    begin = begin_
+            parts = [intersection]
+
+        begin, end = (
+            datetime.fromtimestamp(t, timezone.utc)
+            for t in (parts[0].coords[0][2], parts[-1].coords[-1][2])
+        )
 
         return self.between(begin, end)
 
     def clip_altitude(self, min_: int, max_: int) -> Iterator["Flight"]:
         def buffer_to_iter(proj, buffer):
-            df = pd.DataFrame.from_records(buffer)
+            # buffer is a list of rows (Series) sharing the same columns
+            df = pd.DataFrame(buffer).reset_index(drop=True)
 
             df["lon1"], df["lat1"] = pyproj.transform(
                 proj, pyproj.Proj(init="EPSG:4326"), df.x1.values, df.y1.values
@@ -286,14 +356,26 @@ class SO6(DataFrameMixin):
 
     identifier = Union[int, str]
 
+    # https://github.com/python/mypy/issues/1362
+    @property  # type: ignore
+    @lru_cache()
+    def _by_flight_id(self) -> pd.core.groupby.DataFrameGroupBy:
+        return self.data.groupby("flight_id")
+
+    # https://github.com/python/mypy/issues/1362
+    @property  # type: ignore
+    @lru_cache()
+    def _by_callsign(self) -> pd.core.groupby.DataFrameGroupBy:
+        return self.data.groupby("callsign", sort=False)
+
     def __getitem__(self, _id: identifier) -> Flight:
         if isinstance(_id, int):
-            return Flight(self.data.groupby("flight_id").get_group(_id))
+            return Flight(self._by_flight_id.get_group(_id))
         if isinstance(_id, str):
-            return Flight(self.data.groupby("callsign").get_group(_id))
+            return Flight(self._by_callsign.get_group(_id))
 
     def __iter__(self) -> Iterator[Flight]:
-        for _, flight in self.data.groupby("flight_id"):
+        for _, flight in self._by_flight_id:
             yield Flight(flight)
 
     def __len__(self) -> int:
@@ -312,7 +394,7 @@ class SO6(DataFrameMixin):
         return self + other
 
     def get(self, callsign: str) -> Iterable[Tuple[int, Flight]]:
-        all_flights = self.data.groupby("callsign").get_group(callsign)
+        all_flights = self._by_callsign.get_group(callsign)
         for flight_id, flight in all_flights.groupby("flight_id"):
             yield flight_id, Flight(flight)
 
@@ -369,7 +451,7 @@ class SO6(DataFrameMixin):
         so6 = pd.read_csv(
             filename,
             sep=" ",
-            header=-1,
+            header=None,
             names=[
                 "d1",
                 "origin",
@@ -392,6 +474,15 @@ class SO6(DataFrameMixin):
                 "d4",
                 "d5",
             ],
+            # dummy columns are skipped by the parser
+            usecols=lambda col: col not in ("d1", "d2", "d3", "d4", "d5"),
+            # few distinct values repeated on every segment
+            dtype={
+                "origin": "category",
+                "destination": "category",
+                "aircraft": "category",
+                "callsign": "category",
+            },
         )
 
         so6 = so6.assign(
@@ -401,21 +492,11 @@ class SO6(DataFrameMixin):
             lon2=so6.lon2 / 60,
             alt1=so6.alt1 * 100,
             alt2=so6.alt2 * 100,
-            time1=so6.date1.apply(time) + so6.hour1.apply(hour),
-            time2=so6.date2.apply(time) + so6.hour2.apply(hour),
+            time1=_timestamps(so6.date1, so6.hour1),
+            time2=_timestamps(so6.date2, so6.hour2),
         )
 
-        for col in (
-            "d1",
-            "d2",
-            "d3",
-            "d4",
-            "d5",
-            "date1",
-            "date2",
-            "hour1",
-            "hour2",
-        ):
+        for col in ("date1", "date2", "hour1", "hour2"):
             del so6[col]
 
         return cls(so6)
@@ -453,11 +534,22 @@ class SO6(DataFrameMixin):
             return cls.from_so6(filename)
         return super().from_file(filename)
 
+    # https://github.com/python/mypy/issues/1362
+    @property  # type: ignore
+    @lru_cache()
+    def _sorted_time1(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the permutation sorting time1, and the sorted values."""
+        time1 = self.data.time1.values
+        order = np.argsort(time1, kind="stable")
+        return order, time1[order]
+
     def at(self, time: timelike) -> "SO6":
-        time = to_datetime(time)
-        return SO6(
-            self.data[(self.data.time1 <= time) & (self.data.time2 > time)]
-        )
+        time = np.datetime64(pd.Timestamp(to_datetime(time)).value, "ns")
+        order, time1 = self._sorted_time1
+        # segments starting before time are found by binary search
+        candidates = order[: np.searchsorted(time1, time, side="right")]
+        active = candidates[self.data.time2.values[candidates] > time]
+        return SO6(self.data.iloc[np.sort(active)])
 
     def between(self, start: timelike, stop: time_or_delta) -> "SO6":
         start = to_datetime(start)
@@ -469,12 +561,42 @@ class SO6(DataFrameMixin):
             self.data[(self.data.time1 <= stop) & (self.data.time2 >= start)]
         )
 
-    def intersects(self, sector: Airspace) -> "SO6":
-        return SO6(
-            self.data.groupby("flight_id").filter(
-                lambda flight: Flight(flight).intersects(sector)
-            )
+    def intersects(
+        self, sector: Airspace, max_workers: Optional[int] = None
+    ) -> "SO6":
+        """Selects flights intersecting the given sector.
+
+        Candidate flights are checked concurrently in a pool of max_workers
+        threads (default value as in concurrent.futures).
+        """
+        west, south, east, north = sector.flatten().bounds
+        lon1, lon2 = self.data.lon1.values, self.data.lon2.values
+        lat1, lat2 = self.data.lat1.values, self.data.lat2.values
+
+        # only flights with a segment overlapping the bounding box of the
+        # sector are checked against its actual geometry
+        overlap = (
+            (np.minimum(lon1, lon2) <= east)
+            & (np.maximum(lon1, lon2) >= west)
+            & (np.minimum(lat1, lat2) <= north)
+            & (np.maximum(lat1, lat2) >= south)
         )
+        candidates = self.data.flight_id[overlap].unique()
+        subset = self.data[self.data.flight_id.isin(candidates)]
+
+        def check(group: Tuple[int, pd.DataFrame]) -> bool:
+            return Flight(group[1]).intersects(sector)
+
+        groups = list(subset.groupby("flight_id"))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            flight_ids = list(
+                flight_id
+                for (flight_id, _), match in zip(
+                    groups, executor.map(check, groups)
+                )
+                if match
+            )
+        return SO6(self.data[self.data.flight_id.isin(flight_ids)])
 
     def inside_bbox(self, bounds: Union[Airspace, Tuple[float, ...]]) -> "SO6":
 
@@ -486,16 +608,6 @@ class SO6(DataFrameMixin):
 
         west, south, east, north = bounds
 
-        # Transform coords into intelligible floats
-        # '-2.06 <= lon1 <= 4.50 & 42.36 <= lat1 <= 48.14', instead of
-        #  (-2.066666603088379, 42.366943359375, 4.491666793823242,
-        #   48.13333511352539)
-        # dec = Decimal('0.00')
-        # west = Decimal(west).quantize(dec, rounding=ROUND_DOWN)
-        # east = Decimal(east).quantize(dec, rounding=ROUND_UP)
-        # south = Decimal(south).quantize(dec, rounding=ROUND_DOWN)
-        # north = Decimal(north).quantize(dec, rounding=ROUND_UP)
-
         # the numexpr query is 10% faster than the regular
         # data[data.lat1 >= ...] conjunctions of comparisons
         query = "{0} <= lon1 <= {2} and {1} <= lat1 <= {3}"
@@ -503,13 +615,10 @@ class SO6(DataFrameMixin):
 
         data = self.data.query(query)
 
-        callsigns: Set[str] = set(data.callsign)
+        # keep every flight with at least one point inside the box
+        flight_ids: Set[int] = set(data.flight_id)
 
-        return SO6(
-            self.data.groupby("flight_id").filter(
-                lambda data: data.iloc[0].callsign in callsigns
-            )
-        )
+        return SO6(self.data[self.data.flight_id.isin(flight_ids)])
 
     def select(self, query: Union["SO6", Iterable[str]]) -> "SO6":
         if isinstance(query, SO6):